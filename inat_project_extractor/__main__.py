@@ -1,14 +1,16 @@
 import logging
+import os
 from pprint import pprint as print
 import sys
 
 from dotenv import load_dotenv
 from errorhandler import ErrorHandler  # type: ignore
 
-from client import get_project_data
 from configuration import get_configuration, Configuration
 from export import export
-from merge import merge_bulk_and_api_files
+
+# client and merge are imported where used; see check_startup.py.
+
 
 def _configure_logging(log_level: str) -> None:
 
@@ -27,6 +29,8 @@ def _configure_logging(log_level: str) -> None:
 
 
 def _run(config: Configuration) -> str:
+    from client import get_project_data
+
     file_path = config.get_api_file_output_path()
 
     while 1==1:
@@ -52,10 +56,31 @@ def main() -> None:
     logger.info("Starting iNaturalist project data extractor.")
     logger.info(f"Configuration: {config}")
 
-    file_path = _run(config)
+    # A download starting from the first observation covers the whole project.
+    full_download = config.last_id == "0"
+
+    if config.partitioned and not full_download:
+        from partition import check_last_id
+
+        check_last_id(config)
+
+    api_file = _run(config)
+    file_path = api_file
+
+    if (config.input_file) and os.path.exists(api_file):
+        from merge import merge_bulk_and_api_files
+
+        file_path = merge_bulk_and_api_files(config, api_file)
+
+    if config.partitioned:
+        from partition import write_partitions
 
-    if (config.input_file):
-        merge_bulk_and_api_files(config, file_path)
+        write_partitions(
+            config,
+            file_path,
+            full_download,
+            api_file if config.input_file else None,
+        )
 
     logger.info("Finished with data extraction.")
 
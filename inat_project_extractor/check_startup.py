@@ -0,0 +1,88 @@
+"""
+Startup budget check for the extractor. Runs `python -X importtime . --help`
+and fails if a module that should only be loaded on demand is imported, or if
+the total import time exceeds the budget.
+
+Usage: python check_startup.py [--budget-ms 300]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# These are only needed once a download or merge begins.
+FORBIDDEN_MODULES = ["pandas", "numpy", "requests", "opnieuw"]
+DEFAULT_BUDGET_MS = 300
+
+
+def _parse_import_times(stderr: str) -> Dict[str, int]:
+    # Lines look like "import time:      1234 |       5678 |   package.module",
+    # where nested imports are indented. Only top-level imports are kept, so
+    # that each cumulative time is counted once.
+    cumulative: Dict[str, int] = dict()
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        columns = line[len("import time:"):].split("|")
+        if len(columns) != 3 or not columns[1].strip().isdigit():
+            continue
+
+        name = columns[2].rstrip()
+        if name.startswith("  "):
+            continue
+
+        cumulative[name.strip()] = int(columns[1])
+
+    return cumulative
+
+
+def _find_all_modules(stderr: str) -> List[str]:
+    return [
+        line.split("|")[-1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--budget-ms",
+        default=DEFAULT_BUDGET_MS,
+        help=f"Maximum total import time in milliseconds. Default: {DEFAULT_BUDGET_MS}.",
+        type=int,
+    )
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", ".", "--help"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(f"`python . --help` exited with code {result.returncode}")
+
+    modules = _find_all_modules(result.stderr)
+    loaded = [
+        m for m in FORBIDDEN_MODULES if any(n == m or n.startswith(f"{m}.") for n in modules)
+    ]
+
+    total_ms = sum(_parse_import_times(result.stderr).values()) / 1000
+    print(f"Total import time: {total_ms:.1f} ms (budget {args.budget_ms} ms)")
+
+    if loaded:
+        sys.exit(f"Modules that should be imported lazily were loaded: {', '.join(loaded)}")
+
+    if total_ms > args.budget_ms:
+        sys.exit(f"Import time of {total_ms:.1f} ms exceeds budget of {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,9 @@ class Configuration:
         download from the next available observation.
     input_file: str
         An input file to merge with the downloaded data.
+    partitioned: bool
+        Also write the output into a partitioned layout by project, observation
+        year, and observation month.
     """
 
     api_token: str
@@ -41,6 +44,7 @@ class Configuration:
     output_directory: str
     last_id: str
     input_file: str
+    partitioned: bool = False
 
     def _create_dir(self, output_type: str) -> str:
         dir = os.path.join(self.output_directory, output_type)
@@ -92,6 +96,14 @@ class Configuration:
         """
         return self._prep_file_path("merged")
 
+    def get_partition_root(self) -> str:
+        """
+        Builds the root directory for partitioned output. Unlike the other
+        output files, this directory is shared across runs so that each run
+        only updates the partitions that it touches.
+        """
+        return self._create_dir("partitioned")
+
 
 def get_configuration(args_in: List[str]) -> Configuration:
     """
@@ -172,6 +184,12 @@ def get_configuration(args_in: List[str]) -> Configuration:
         env_var="INPUT_FILE",
         default=None
     )
+    parser.add(
+        "--partitioned",
+        help="Also write output into project=/observed_year=/observed_month= partition directories",
+        action="store_true",
+        env_var="PARTITIONED"
+    )
 
     args_parsed = parser.parse_args(args_in)
 
@@ -183,5 +201,6 @@ def get_configuration(args_in: List[str]) -> Configuration:
         page_size=args_parsed.page_size,
         output_directory=args_parsed.output_directory,
         last_id=args_parsed.last_id,
-        input_file=args_parsed.input_file
+        input_file=args_parsed.input_file,
+        partitioned=args_parsed.partitioned
     )
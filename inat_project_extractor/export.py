@@ -1,10 +1,65 @@
+import csv
 import logging
+import os
 from typing import List, Optional
 
-import pandas as pd
-
 logger = logging.getLogger(__name__)
 
+COLUMN_ORDER = [
+    "id",
+    "species_guess",
+    "scientific_name",
+    "common_name",
+    "iconic_taxon_name",
+    "taxon_id",
+    "id_please",
+    "num_identification_agreements",
+    "num_identification_disagreements",
+    "observed_on_string",
+    "observed_on",
+    "time_observed_at",
+    "time_zone",
+    "place_guess",
+    "latitude",
+    "longitude",
+    "positional_accuracy",
+    "private_place_guess",
+    "private_latitude",
+    "private_longitude",
+    "private_positional_accuracy",
+    "geoprivacy",
+    "taxon_geoprivacy",
+    "coordinates_obscured",
+    "positioning_method",
+    "positioning_device",
+    "out_of_range",
+    "user_id",
+    "user_login",
+    "created_at",
+    "updated_at",
+    "quality_grade",
+    "license",
+    "url",
+    "image_url",
+    "sound_url",
+    "tag_list",
+    "description",
+    "oauth_application_id",
+    "captive_cultivated",
+    "curator_ident_taxon_id",
+    "curator_ident_taxon_name",
+    "curator_ident_user_id",
+    "curator_ident_user_login",
+    "tracking_code",
+    "curator_coordinate_access",
+    "field:count",
+    "field:distance to animal",
+    "field:whooping crane habitat",
+    "field:list of hazards present",
+    "field:crane behavior",
+    "field:well-being",
+]
+
 
 def _get_latitude(geojson: dict) -> Optional[float]:
     if geojson.get("type", "?") != "Point":
@@ -129,7 +184,9 @@ def _flatten_data(results: List[dict]) -> List[dict]:
 
 def export(file_path: str, results: List[dict]):
     """
-    Writes data out to a CSV file in append mode.
+    Writes data out to a CSV file in append mode. The header row is only
+    written when the file is new, so that successive batches can be streamed
+    into the same file.
 
     Parameters
     ----------
@@ -139,63 +196,18 @@ def export(file_path: str, results: List[dict]):
         A list of observations,  each of which is a dictionary
     """
 
-    df = pd.DataFrame(_flatten_data(results))
-
-    column_order = [
-        "id",
-        "species_guess",
-        "scientific_name",
-        "common_name",
-        "iconic_taxon_name",
-        "taxon_id",
-        "id_please",
-        "num_identification_agreements",
-        "num_identification_disagreements",
-        "observed_on_string",
-        "observed_on",
-        "time_observed_at",
-        "time_zone",
-        "place_guess",
-        "latitude",
-        "longitude",
-        "positional_accuracy",
-        "private_place_guess",
-        "private_latitude",
-        "private_longitude",
-        "private_positional_accuracy",
-        "geoprivacy",
-        "taxon_geoprivacy",
-        "coordinates_obscured",
-        "positioning_method",
-        "positioning_device",
-        "out_of_range",
-        "user_id",
-        "user_login",
-        "created_at",
-        "updated_at",
-        "quality_grade",
-        "license",
-        "url",
-        "image_url",
-        "sound_url",
-        "tag_list",
-        "description",
-        "oauth_application_id",
-        "captive_cultivated",
-        "curator_ident_taxon_id",
-        "curator_ident_taxon_name",
-        "curator_ident_user_id",
-        "curator_ident_user_login",
-        "tracking_code",
-        "curator_coordinate_access",
-        "field:count",
-        "field:distance to animal",
-        "field:whooping crane habitat",
-        "field:list of hazards present",
-        "field:crane behavior",
-        "field:well-being",
-    ]
-
-    df = df.reindex(columns=column_order)
-
-    df.to_csv(file_path, index=False, mode="a")
+    write_header = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+
+    with open(file_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=COLUMN_ORDER,
+            restval="",
+            extrasaction="ignore",
+            lineterminator="\n",
+        )
+
+        if write_header:
+            writer.writeheader()
+
+        writer.writerows(_flatten_data(results))
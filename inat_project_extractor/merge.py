@@ -1,13 +1,14 @@
 import logging
 
-import pandas as pd
-
 from configuration import Configuration
 
 logger = logging.getLogger(__name__)
 
 
-def merge_bulk_and_api_files(config: Configuration, api_file: str) -> None:
+def merge_bulk_and_api_files(config: Configuration, api_file: str) -> str:
+    # pandas is slow to import, and is only needed when merging with a bulk
+    # export file, so load it here rather than at module level.
+    import pandas as pd
 
     api_columns = [
         "id",
@@ -34,3 +35,5 @@ def merge_bulk_and_api_files(config: Configuration, api_file: str) -> None:
 
     logger.info(f"Writing merged file: {merge_path}")
     merge.to_csv(merge_path, index=False)
+
+    return merge_path
@@ -0,0 +1,344 @@
+import csv
+from datetime import datetime
+import glob
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional, Set, Tuple
+import uuid
+
+from configuration import Configuration
+
+logger = logging.getLogger(__name__)
+
+# Used by Hive, Spark and Arrow for rows where the partition value is missing.
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+PARTITION_FILE_NAME = "part.csv"
+MANIFEST_DIRECTORY = "_manifests"
+INDEX_DIRECTORY = "_index"
+
+
+def _get_partition_key(row: dict) -> Tuple[str, str]:
+    # observed_on is formatted as YYYY-MM-DD in both the API and bulk exports.
+    observed_on = row.get("observed_on") or ""
+    parts = observed_on.split("-")
+
+    if len(parts) < 2 or not parts[0].isdigit() or not parts[1].isdigit():
+        return DEFAULT_PARTITION, DEFAULT_PARTITION
+
+    return parts[0], parts[1].zfill(2)
+
+
+def _build_project_directory(config: Configuration) -> str:
+    return os.path.join(config.get_partition_root(), f"project={config.project_slug}")
+
+
+def _build_partition_directory(config: Configuration, key: Tuple[str, str]) -> str:
+    year, month = key
+    return os.path.join(
+        _build_project_directory(config),
+        f"observed_year={year}",
+        f"observed_month={month}",
+    )
+
+
+def _find_partition_files(config: Configuration) -> Dict[Tuple[str, str], str]:
+    pattern = os.path.join(
+        _build_project_directory(config),
+        "observed_year=*",
+        "observed_month=*",
+        PARTITION_FILE_NAME,
+    )
+
+    files = dict()
+    for file_path in glob.glob(pattern):
+        month_directory = os.path.dirname(file_path)
+        year_directory = os.path.dirname(month_directory)
+        key = (
+            os.path.basename(year_directory).split("=", 1)[1],
+            os.path.basename(month_directory).split("=", 1)[1],
+        )
+        files[key] = file_path
+
+    return files
+
+
+def _sort_key(row: dict):
+    id = row.get("id") or ""
+    return (0, int(id)) if id.isdigit() else (1, id)
+
+
+def _replace_file(file_path: str, write) -> None:
+    # Write to a hidden temporary file next to the destination and then swap it
+    # in, so that a reader never sees a partially written file. Dataset readers
+    # skip names starting with "." so a leftover temp file is never read.
+    directory = os.path.dirname(file_path)
+
+    f = tempfile.NamedTemporaryFile(
+        mode="w", dir=directory, prefix=".", delete=False, newline="", encoding="utf-8"
+    )
+    try:
+        with f:
+            write(f)
+
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, file_path)
+    finally:
+        if os.path.exists(f.name):
+            os.remove(f.name)
+
+
+def _read_csv(file_path: str) -> Tuple[List[str], List[dict]]:
+    with open(file_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        return list(reader.fieldnames or []), rows
+
+
+def _read_ids(file_path: str) -> Tuple[List[str], Set[str]]:
+    with open(file_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, [])
+        if "id" not in fieldnames:
+            return fieldnames, set()
+
+        index = fieldnames.index("id")
+        return fieldnames, {r[index] for r in reader if len(r) > index}
+
+
+def _remove_partition(file_path: str) -> None:
+    os.remove(file_path)
+
+    # Tidy up the month and year directories if they are now empty.
+    month_directory = os.path.dirname(file_path)
+    for directory in (month_directory, os.path.dirname(month_directory)):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+
+
+def _write_partition(file_path: str, fieldnames: List[str], rows: List[dict]) -> int:
+    if len(rows) == 0:
+        if os.path.exists(file_path):
+            _remove_partition(file_path)
+        return 0
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    def _write(f):
+        writer = csv.DictWriter(
+            f, fieldnames=fieldnames, restval="", lineterminator="\n"
+        )
+        writer.writeheader()
+        writer.writerows(sorted(rows, key=_sort_key))
+
+    _replace_file(file_path, _write)
+
+    return len(rows)
+
+
+def _build_index_path(config: Configuration) -> str:
+    return os.path.join(
+        config.get_partition_root(), INDEX_DIRECTORY, f"{config.project_slug}.json"
+    )
+
+
+def _read_index(config: Configuration) -> Optional[dict]:
+    # The index records which partition holds each observation id, and the
+    # last observation id up to which the partitions are complete.
+    index_path = _build_index_path(config)
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+
+    index["partitions"] = {
+        id: tuple(key) for id, key in index["partitions"].items()
+    }
+    return index
+
+
+def _write_index(
+    config: Configuration, partitions: Dict[str, Tuple[str, str]]
+) -> None:
+    index_path = _build_index_path(config)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+
+    index = {"last_id": config.last_id, "partitions": partitions}
+    _replace_file(index_path, lambda f: json.dump(index, f))
+
+
+def check_last_id(config: Configuration) -> None:
+    """
+    Confirms that an incremental download can be added to the partitions,
+    before starting the download. Exits the program if the partitions have not
+    been built yet, or if `last_id` would skip observations that have not been
+    partitioned, for example because an earlier run crashed.
+
+    Parameters
+    ----------
+    config: Configuration
+        A custom Configuration object containing important settings.
+    """
+    index = _read_index(config)
+
+    if index is None:
+        logger.fatal(
+            f"There are no partitions for project {config.project_slug}. "
+            "Run with --last-id 0 to build them."
+        )
+        sys.exit(2)
+
+    if int(config.last_id) > int(index["last_id"]):
+        logger.fatal(
+            f"Partitions are only complete up to observation {index['last_id']}. "
+            f"Run with --last-id {index['last_id']} to continue from there, or "
+            "with --last-id 0 to rebuild them."
+        )
+        sys.exit(2)
+
+
+def _write_manifest(config: Configuration, file_path: str, written: List[dict]) -> str:
+    manifest_directory = os.path.join(config.get_partition_root(), MANIFEST_DIRECTORY)
+    os.makedirs(manifest_directory, exist_ok=True)
+
+    # The random suffix keeps runs that start in the same second apart.
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d-%H-%M-%S")
+    manifest_path = os.path.join(
+        manifest_directory,
+        f"{config.project_slug}.{timestamp}.{uuid.uuid4().hex[:8]}.json",
+    )
+    manifest = {
+        "project": config.project_slug,
+        "created_at": now.isoformat(),
+        "source_file": file_path,
+        "last_id": config.last_id,
+        "partitions": written,
+    }
+
+    logger.info(f"Writing partition manifest: {manifest_path}")
+    _replace_file(manifest_path, lambda f: json.dump(manifest, f, indent=2))
+
+    return manifest_path
+
+
+def write_partitions(
+    config: Configuration,
+    file_path: str,
+    replace_all: bool,
+    api_file: Optional[str] = None,
+) -> str:
+    """
+    Copies the observations in a CSV file into a Hive-style partitioned layout,
+    `project=<slug>/observed_year=<YYYY>/observed_month=<MM>/part.csv`, under
+    the `partitioned` output directory. An index of which partition holds each
+    observation id is updated next, and a JSON manifest listing the partitions
+    changed by this run is written last.
+
+    When `replace_all` is set, the file is treated as the complete project:
+    every partition is rewritten from it and partitions with no observations
+    are removed. Otherwise the file's observations are added to the existing
+    partitions, first removing them by id from the partition the index says
+    they were in before, and only partitions that change are rewritten. In
+    that case the file must have the same columns as the existing partitions,
+    so switching between merged and API-only output requires a run with
+    `replace_all`.
+
+    Parameters
+    ----------
+    config: Configuration
+        A custom Configuration object containing important settings.
+    file_path: str
+        Full path to the CSV file to partition. If it does not exist, because
+        there were no new observations, then an empty manifest is written.
+    replace_all: bool
+        True if the file contains every observation in the project.
+    api_file: Optional[str]
+        For an incremental run with merged output, the downloaded file. Only
+        observations that were downloaded are updated, so that rows from the
+        bulk export do not overwrite the curator data partitioned by earlier
+        runs.
+
+    Returns
+    -------
+    str
+        Full path to the manifest file.
+    """
+    source_file = api_file or file_path
+    if not os.path.exists(file_path) or not os.path.exists(source_file):
+        logger.info("No new observations to partition.")
+        return _write_manifest(config, file_path, list())
+
+    fieldnames, rows = _read_csv(file_path)
+
+    if api_file is not None and not replace_all:
+        _, downloaded_ids = _read_ids(api_file)
+        rows = [r for r in rows if r["id"] in downloaded_ids]
+
+    partitions: Dict[Tuple[str, str], List[dict]] = dict()
+    for r in rows:
+        partitions.setdefault(_get_partition_key(r), list()).append(r)
+
+    incoming_ids = {r["id"] for r in rows}
+    updates: Dict[Tuple[str, str], List[dict]] = dict()
+
+    if replace_all:
+        for key in _find_partition_files(config):
+            updates[key] = list()
+
+        index: Dict[str, Tuple[str, str]] = dict()
+    else:
+        index = (_read_index(config) or {"partitions": dict()})["partitions"]
+
+        affected = set(partitions)
+        affected.update(index[id] for id in incoming_ids if id in index)
+
+        for key in affected:
+            existing_file = os.path.join(
+                _build_partition_directory(config, key), PARTITION_FILE_NAME
+            )
+            if not os.path.exists(existing_file):
+                continue
+
+            existing_fieldnames, existing_rows = _read_csv(existing_file)
+            if existing_fieldnames != fieldnames:
+                logger.fatal(
+                    f"Columns in {file_path} do not match the existing partition "
+                    f"{existing_file}. Re-run with --last-id 0 to rebuild the partitions."
+                )
+                sys.exit(2)
+
+            updates[key] = [r for r in existing_rows if r["id"] not in incoming_ids]
+
+    for key, new_rows in partitions.items():
+        updates[key] = updates.get(key, list()) + new_rows
+        for r in new_rows:
+            index[r["id"]] = key
+
+    written = list()
+    for key in sorted(updates):
+        partition_file = os.path.join(
+            _build_partition_directory(config, key), PARTITION_FILE_NAME
+        )
+        logger.info(f"Writing partition: {partition_file}")
+
+        row_count = _write_partition(partition_file, fieldnames, updates[key])
+
+        written.append(
+            {
+                "path": os.path.relpath(partition_file, config.get_partition_root()),
+                "observed_year": key[0],
+                "observed_month": key[1],
+                "rows_added_or_updated": len(partitions.get(key, list())),
+                "total_rows": row_count,
+            }
+        )
+
+    _write_index(config, index)
+
+    return _write_manifest(config, file_path, written)